@@ -0,0 +1,290 @@
+"""
+Shared Google API helpers for the spreadsheet maintenance scripts.
+
+Credentials and service objects are memoized so a script (or several
+scripts imported into the same process) only authenticates and builds
+each API client once. Sheet IDs are cached on disk between runs.
+
+The Google client libraries are imported inside the functions that use
+them, so importing this module (e.g. just to parse a spreadsheet URL)
+stays cheap.
+"""
+
+import atexit
+import functools
+import json
+import os.path
+import re
+import threading
+import time
+
+_ID_RE = re.compile(r'/spreadsheets/d/([a-zA-Z0-9_-]+)')
+
+SHEET_IDS_CACHE_DIR = os.path.expanduser('~/.cache/sjsneakerz')
+SHEET_IDS_CACHE_TTL = 24 * 60 * 60  # seconds
+
+# Passed to execute() so googleapiclient retries 429 and 5xx responses
+# with randomized exponential backoff. Only use it for reads and value
+# writes: it also retries after timeouts, when the server may already
+# have applied the request, so structural batchUpdates (deleting columns
+# or sheets, adding filter views) must not be retried.
+NUM_RETRIES = 5
+
+@functools.lru_cache(maxsize=None)
+def get_creds(scopes):
+    """Authenticate and return credentials for the given tuple of scopes.
+
+    The result is cached in memory, so repeated calls in the same process
+    don't re-read token.json.
+    """
+    from google.auth.credentials import TokenState
+    from google.auth.transport.requests import Request
+    from google_auth_oauthlib.flow import InstalledAppFlow
+
+    creds = None
+
+    if os.path.exists('token.json'):
+        creds = _background_refresh_credentials().from_authorized_user_file(
+            'token.json', list(scopes))
+
+        # A token close to expiry can still be used. Refresh it in a
+        # background thread instead of blocking.
+        if creds.token_state == TokenState.STALE and creds.refresh_token:
+            creds.start_background_refresh()
+            return creds
+
+    if not creds or not creds.valid:
+        if creds and creds.expired and creds.refresh_token:
+            creds.refresh(Request())
+        else:
+            if not os.path.exists('credentials.json'):
+                print("\nError: credentials.json not found!")
+                print("Please follow the setup instructions in README.md")
+                print("to create OAuth credentials and download them as credentials.json")
+                exit(1)
+
+            flow = InstalledAppFlow.from_client_secrets_file(
+                'credentials.json', list(scopes))
+            creds = flow.run_local_server(port=0)
+
+        _save_token(creds)
+
+    return creds
+
+@functools.lru_cache(maxsize=None)
+def _background_refresh_credentials():
+    """Return a Credentials subclass that can refresh a stale token in the background.
+
+    The class is built on first use so the Google libraries stay lazily
+    imported.
+    """
+    from google.auth.credentials import TokenState
+    from google.auth.transport.requests import Request
+    from google.oauth2.credentials import Credentials
+
+    class BackgroundRefreshCredentials(Credentials):
+        """Credentials that keep using a stale token while a copy is refreshed."""
+
+        _refresh_thread = None
+
+        def start_background_refresh(self):
+            """Refresh a copy of these credentials in a daemon thread."""
+            self._refresh_lock = threading.Lock()
+            self._refresh_thread = threading.Thread(
+                target=self._refresh_copy, daemon=True)
+            self._refresh_thread.start()
+
+            # Wait for the refresh at exit (a short script may finish
+            # first), so the next run starts with the refreshed token.json
+            atexit.register(self._refresh_thread.join, 10)
+
+        def _refresh_copy(self):
+            """Refresh a copy, then swap its token in and save it."""
+            # The copy is refreshed on a transport of its own: the shared
+            # AuthorizedHttp from get_http() may be busy on the main
+            # thread, and httplib2 isn't thread-safe
+            fresh = Credentials.from_authorized_user_info(json.loads(self.to_json()))
+            try:
+                fresh.refresh(Request())
+            except Exception:
+                # Left for the blocking refresh once the token expires
+                return
+
+            with self._refresh_lock:
+                self.token = fresh.token
+                self.expiry = fresh.expiry
+            _save_token(fresh)
+
+        def before_request(self, request, method, url, headers):
+            thread = self._refresh_thread
+            if thread is not None and thread.is_alive():
+                # A stale token is still accepted, so use it instead of
+                # starting a second, blocking refresh. Once it has expired,
+                # wait for the background refresh to finish.
+                with self._refresh_lock:
+                    if self.token_state == TokenState.STALE:
+                        self.apply(headers)
+                        return
+                thread.join()
+
+            super().before_request(request, method, url, headers)
+
+    return BackgroundRefreshCredentials
+
+def _save_token(creds):
+    """Write creds to token.json, unless it already holds the same token."""
+    token_json = creds.to_json()
+
+    try:
+        with open('token.json') as token:
+            if token.read() == token_json:
+                return
+    except OSError:
+        pass
+
+    # Write to a temporary file and rename it into place, so a crash
+    # mid-write can't leave a corrupt token.json behind
+    with open('token.json.tmp', 'w') as token:
+        token.write(token_json)
+        token.flush()
+        os.fsync(token.fileno())
+    os.replace('token.json.tmp', 'token.json')
+
+@functools.lru_cache(maxsize=None)
+def get_http(scopes):
+    """Return one authorized HTTP client for the given tuple of scopes.
+
+    Every service built for the same scopes shares it, so requests reuse
+    its kept-alive connections instead of opening new ones.
+    """
+    from google_auth_httplib2 import AuthorizedHttp
+    from googleapiclient.http import build_http
+
+    return AuthorizedHttp(get_creds(scopes), http=build_http())
+
+@functools.lru_cache(maxsize=None)
+def get_service(api, version, scopes):
+    """Build and return a Google API service object.
+
+    Uses the discovery document bundled with google-api-python-client
+    instead of fetching it over HTTPS on every run.
+    """
+    from googleapiclient.discovery import build
+
+    return build(
+        api,
+        version,
+        http=get_http(scopes),
+        static_discovery=True,
+        cache_discovery=False
+    )
+
+def extract_spreadsheet_id(user_input):
+    """Return the spreadsheet ID from a Google Sheets URL or a bare ID.
+
+    Returns None if the input looks like a Sheets URL but has no ID in it.
+    """
+    if 'docs.google.com/spreadsheets' not in user_input:
+        return user_input
+
+    match = _ID_RE.search(user_input)
+    return match.group(1) if match else None
+
+def get_sheet_ids(service, spreadsheet_id, fields='sheets.properties(sheetId,title)'):
+    """Get the sheet IDs for all sheets in the spreadsheet.
+
+    Returns a dict mapping sheet titles to sheet IDs, and the raw list of
+    sheets with whatever else `fields` asked for (e.g. row counts or
+    filter views). `fields` must include sheets.properties(sheetId,title).
+    """
+    # Only request the given fields instead of the full spreadsheet payload
+    sheet_metadata = service.spreadsheets().get(
+        spreadsheetId=spreadsheet_id,
+        fields=fields
+    ).execute(num_retries=NUM_RETRIES)
+    sheets = sheet_metadata.get('sheets', [])
+
+    sheet_ids = {}
+    for sheet in sheets:
+        title = sheet['properties']['title']
+        sheet_id = sheet['properties']['sheetId']
+        sheet_ids[title] = sheet_id
+
+    return sheet_ids, sheets
+
+def get_sheet_ids_cached(service, spreadsheet_id, required=(), refresh=False):
+    """Get the sheet IDs, reusing the on-disk cache if it is fresh.
+
+    The cache is bypassed when it is older than SHEET_IDS_CACHE_TTL, when
+    any sheet in `required` is missing from it, or when `refresh` is set.
+    """
+    cache_path = os.path.join(
+        SHEET_IDS_CACHE_DIR, f'sheet-ids-{spreadsheet_id}.json')
+
+    if not refresh:
+        try:
+            if time.time() - os.path.getmtime(cache_path) < SHEET_IDS_CACHE_TTL:
+                with open(cache_path) as f:
+                    sheet_ids = json.load(f)
+                if all(title in sheet_ids for title in required):
+                    return sheet_ids
+        except (OSError, ValueError):
+            pass
+
+    sheet_ids, _ = get_sheet_ids(service, spreadsheet_id)
+
+    os.makedirs(SHEET_IDS_CACHE_DIR, exist_ok=True)
+    with open(cache_path, 'w') as f:
+        json.dump(sheet_ids, f)
+
+    return sheet_ids
+
+def _can_prefetch_creds():
+    """Return whether get_creds can run without the browser OAuth flow.
+
+    That needs a token.json holding a refresh_token: either the token is
+    still valid, or it can be refreshed without the user.
+    """
+    try:
+        with open('token.json') as token:
+            return bool(json.load(token).get('refresh_token'))
+    except (OSError, ValueError, AttributeError):
+        return False
+
+def _prefetch_creds(scopes):
+    """Load credentials ahead of time, leaving any errors to the real call."""
+    try:
+        get_creds(scopes)
+    except Exception:
+        pass
+
+def parse_spreadsheet_id(spreadsheet, scopes):
+    """Return the spreadsheet ID from the command line or an input prompt.
+
+    While the user is typing, credentials for `scopes` are loaded (and
+    refreshed if needed) in a background thread, so they are ready once
+    the prompt returns.
+    """
+    if spreadsheet:
+        user_input = spreadsheet
+    else:
+        prefetch = None
+        # Never prefetch when it could start the browser OAuth flow behind
+        # the prompt
+        if _can_prefetch_creds():
+            prefetch = threading.Thread(
+                target=_prefetch_creds, args=(scopes,), daemon=True)
+            prefetch.start()
+
+        user_input = input("URL or ID: ").strip()
+
+        if prefetch:
+            prefetch.join()
+
+    # Extract ID from URL if needed
+    spreadsheet_id = extract_spreadsheet_id(user_input)
+    if spreadsheet_id is None:
+        print("Error: Could not parse spreadsheet ID from URL")
+        exit(1)
+
+    return spreadsheet_id
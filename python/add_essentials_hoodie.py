@@ -5,6 +5,7 @@ Add Essentials Hoodie XL Light Oatmeal to inventory with UPC 460035734583
 
 import sys
 import os
+from collections import defaultdict
 
 # Add parent directory to path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
@@ -37,6 +38,15 @@ item = {
     'Notes': 'Added via script for barcode scanning'
 }
 
+# Inventory columns in sheet order
+columns = (
+    "Item ID", "UPC", "Category", "Brand", "Size", "Color", 
+    "Cost", "Date Purchased", "Status", "Location", "Notes"
+)
+
+# One "   Column: {Column}" line per column, filled in with str.format_map()
+ROW_TEMPLATE = "\n".join(f"   {col}: {{{col}}}" for col in columns)
+
 def get_sheets_service():
     """Create Google Sheets API service"""
     try:
@@ -44,7 +54,9 @@ def get_sheets_service():
             'credentials.json',
             scopes=['https://www.googleapis.com/auth/spreadsheets']
         )
-        return build('sheets', 'v4', credentials=creds)
+        # Use the discovery document bundled with google-api-python-client
+        return build('sheets', 'v4', credentials=creds,
+                     static_discovery=True, cache_discovery=False)
     except FileNotFoundError:
         print("ERROR: credentials.json not found")
         print("You need to set up Google Sheets API credentials")
@@ -55,8 +67,7 @@ def main():
     print("ADD ESSENTIALS HOODIE TO INVENTORY")
     print("=" * 70)
     print(f"\nItem Details:")
-    for key, value in item.items():
-        print(f"  {key}: {value}")
+    print("\n".join(f"  {key}: {value}" for key, value in item.items()))
     print("\n" + "=" * 70)
     
     # Manual instructions (safer than running the script)
@@ -65,13 +76,7 @@ def main():
     print("2. Find the next empty row")
     print("3. Add a new row with these values:\n")
     
-    columns = [
-        "Item ID", "UPC", "Category", "Brand", "Size", "Color", 
-        "Cost", "Date Purchased", "Status", "Location", "Notes"
-    ]
-    
-    for col in columns:
-        print(f"   {col}: {item.get(col, '')}")
+    print(ROW_TEMPLATE.format_map(defaultdict(str, item)))
     
     print("\n4. IMPORTANT: Make sure the UPC is exactly: 460035734583")
     print("   - No spaces, dashes, or extra characters")
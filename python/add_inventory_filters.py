@@ -13,58 +13,26 @@ dependencies = [
 ///
 """
 
-import os.path
-import sys
-from google.auth.transport.requests import Request
-from google.oauth2.credentials import Credentials
-from google_auth_oauthlib.flow import InstalledAppFlow
-from googleapiclient.discovery import build
-from googleapiclient.errors import HttpError
+import argparse
+from _sheets_common import get_service, get_sheet_ids_cached, parse_spreadsheet_id
 
-SCOPES = ['https://www.googleapis.com/auth/spreadsheets']
+SCOPES = ('https://www.googleapis.com/auth/spreadsheets',)
 
-def get_credentials():
-    """Authenticate and return credentials for Google Sheets API."""
-    creds = None
-    
-    if os.path.exists('token.json'):
-        creds = Credentials.from_authorized_user_file('token.json', SCOPES)
-    
-    if not creds or not creds.valid:
-        if creds and creds.expired and creds.refresh_token:
-            creds.refresh(Request())
-        else:
-            if not os.path.exists('credentials.json'):
-                print("\nError: credentials.json not found!")
-                exit(1)
-            
-            flow = InstalledAppFlow.from_client_secrets_file(
-                'credentials.json', SCOPES)
-            creds = flow.run_local_server(port=0)
-        
-        with open('token.json', 'w') as token:
-            token.write(creds.to_json())
-    
-    return creds
-
-def get_sheet_ids(service, spreadsheet_id):
-    """Get the sheet IDs for all sheets in the spreadsheet."""
-    sheet_metadata = service.spreadsheets().get(spreadsheetId=spreadsheet_id).execute()
-    sheets = sheet_metadata.get('sheets', [])
-    
-    sheet_ids = {}
-    for sheet in sheets:
-        title = sheet['properties']['title']
-        sheet_id = sheet['properties']['sheetId']
-        sheet_ids[title] = sheet_id
-    
-    return sheet_ids
+# Filter views to create: (title, criteria). Status column is H (index 7)
+FILTER_VIEWS = (
+    # Filter 1: "In Stock" (default) - hide "Sold"
+    ('In Stock', {'criteria': {7: {'hiddenValues': ['Sold']}}}),
+    # Filter 2: "Sold" - hide "In Stock"
+    ('Sold', {'criteria': {7: {'hiddenValues': ['In Stock']}}}),
+    # Filter 3: "All Statuses" - no hidden values
+    ('All Statuses', {}),
+)
 
-def add_inventory_filters(service, spreadsheet_id):
+def add_inventory_filters(service, spreadsheet_id, refresh=False):
     """Add filter views to Inventory tab."""
     
-    # Get sheet IDs
-    sheet_ids = get_sheet_ids(service, spreadsheet_id)
+    # Get sheet IDs (cached on disk between runs)
+    sheet_ids = get_sheet_ids_cached(service, spreadsheet_id, required=('Inventory',), refresh=refresh)
     
     if 'Inventory' not in sheet_ids:
         print("Error: 'Inventory' tab not found in spreadsheet!")
@@ -72,63 +40,26 @@ def add_inventory_filters(service, spreadsheet_id):
     
     inventory_sheet_id = sheet_ids['Inventory']
     
-    # Status column is H (index 7)
-    requests = []
-    
-    # Filter 1: "In Stock" (default) - hide "Sold"
-    requests.append({
-        'addFilterView': {
-            'filter': {
-                'title': 'In Stock',
-                'range': {
-                    'sheetId': inventory_sheet_id,
-                    'startRowIndex': 0,
-                    'startColumnIndex': 0,
-                    'endColumnIndex': 9  # All columns A-I
-                },
-                'criteria': {
-                    7: {  # Status column (H, index 7)
-                        'hiddenValues': ['Sold']
-                    }
+    # All filter views cover columns A-I, starting from the header row
+    filter_range = {
+        'sheetId': inventory_sheet_id,
+        'startRowIndex': 0,
+        'startColumnIndex': 0,
+        'endColumnIndex': 9  # All columns A-I
+    }
+    
+    requests = [
+        {
+            'addFilterView': {
+                'filter': {
+                    'title': title,
+                    'range': filter_range,
+                    **criteria
                 }
             }
         }
-    })
-    
-    # Filter 2: "Sold" - hide "In Stock"
-    requests.append({
-        'addFilterView': {
-            'filter': {
-                'title': 'Sold',
-                'range': {
-                    'sheetId': inventory_sheet_id,
-                    'startRowIndex': 0,
-                    'startColumnIndex': 0,
-                    'endColumnIndex': 9
-                },
-                'criteria': {
-                    7: {  # Status column (H, index 7)
-                        'hiddenValues': ['In Stock']
-                    }
-                }
-            }
-        }
-    })
-    
-    # Filter 3: "All Statuses" - no hidden values
-    requests.append({
-        'addFilterView': {
-            'filter': {
-                'title': 'All Statuses',
-                'range': {
-                    'sheetId': inventory_sheet_id,
-                    'startRowIndex': 0,
-                    'startColumnIndex': 0,
-                    'endColumnIndex': 9
-                }
-            }
-        }
-    })
+        for title, criteria in FILTER_VIEWS
+    ]
     
     body = {'requests': requests}
     service.spreadsheets().batchUpdate(
@@ -140,40 +71,37 @@ def add_inventory_filters(service, spreadsheet_id):
 
 def main():
     """Main function."""
+    parser = argparse.ArgumentParser(
+        description="Add filter views to the Inventory tab of an existing Google Sheet.")
+    parser.add_argument(
+        'spreadsheet', nargs='?',
+        help="Google Sheets URL or spreadsheet ID (prompted for if omitted)")
+    parser.add_argument(
+        '--refresh', action='store_true',
+        help="Ignore the cached sheet IDs and fetch them again")
+    args = parser.parse_args()
+    
     print("\n=== Add Inventory Filters to Existing Sheet ===\n")
     
     # Get spreadsheet ID from command line or prompt
-    if len(sys.argv) > 1:
-        spreadsheet_id = sys.argv[1]
-    else:
+    if not args.spreadsheet:
         print("Enter your Google Sheets URL or Spreadsheet ID:")
         print("Example URL: https://docs.google.com/spreadsheets/d/SPREADSHEET_ID/edit")
         print("Or just the ID: SPREADSHEET_ID")
         print()
-        user_input = input("URL or ID: ").strip()
-        
-        # Extract ID from URL if needed
-        if 'docs.google.com/spreadsheets' in user_input:
-            # Extract ID from URL
-            parts = user_input.split('/d/')
-            if len(parts) > 1:
-                spreadsheet_id = parts[1].split('/')[0]
-            else:
-                print("Error: Could not parse spreadsheet ID from URL")
-                exit(1)
-        else:
-            spreadsheet_id = user_input
+    spreadsheet_id = parse_spreadsheet_id(args.spreadsheet, SCOPES)
     
     print(f"\nSpreadsheet ID: {spreadsheet_id}")
     print("Authenticating...")
     
+    from googleapiclient.errors import HttpError
+    
     try:
-        creds = get_credentials()
-        service = build('sheets', 'v4', credentials=creds)
+        service = get_service('sheets', 'v4', SCOPES)
         
         print("Adding filter views to Inventory tab...")
         
-        if add_inventory_filters(service, spreadsheet_id):
+        if add_inventory_filters(service, spreadsheet_id, refresh=args.refresh):
             print("\n✓ Successfully added 3 filter views to Inventory tab!")
             print("\nCreated filters:")
             print("  1. In Stock - Shows only items in stock (hides Sold)")
@@ -13,44 +13,49 @@ dependencies = [
 ///
 """
 
-import os.path
-import sys
-from google.auth.transport.requests import Request
-from google.oauth2.credentials import Credentials
-from google_auth_oauthlib.flow import InstalledAppFlow
-from googleapiclient.discovery import build
-from googleapiclient.errors import HttpError
+import argparse
+from _sheets_common import get_service, parse_spreadsheet_id
 
 # Need both Forms and Sheets scopes
-SCOPES = [
+SCOPES = (
     'https://www.googleapis.com/auth/forms.body',
     'https://www.googleapis.com/auth/drive',
     'https://www.googleapis.com/auth/spreadsheets'
-]
+)
 
-def get_credentials():
-    """Authenticate and return credentials for Google APIs."""
-    creds = None
-    
-    if os.path.exists('token.json'):
-        creds = Credentials.from_authorized_user_file('token.json', SCOPES)
-    
-    if not creds or not creds.valid:
-        if creds and creds.expired and creds.refresh_token:
-            creds.refresh(Request())
-        else:
-            if not os.path.exists('credentials.json'):
-                print("\nError: credentials.json not found!")
-                exit(1)
-            
-            flow = InstalledAppFlow.from_client_secrets_file(
-                'credentials.json', SCOPES)
-            creds = flow.run_local_server(port=0)
-        
-        with open('token.json', 'w') as token:
-            token.write(creds.to_json())
-    
-    return creds
+_TEXT = {'textQuestion': {'paragraph': False}}
+
+# Form fields in display order: (title, description, required, question type)
+FORM_FIELDS = (
+    ('UPC', 'Barcode number (optional)', False, _TEXT),
+    ('Category', 'e.g., Hoodie, Jacket, Tee, Pants, Shoes', True, _TEXT),
+    ('Brand', 'Brand name', True, _TEXT),
+    ('Size', None, True, {
+        'choiceQuestion': {
+            'type': 'DROP_DOWN',
+            'options': [{'value': size} for size in ('XS', 'S', 'M', 'L', 'XL', 'XXL')]
+        }
+    }),
+    ('Color', 'Primary color', True, _TEXT),
+    # Could validate as number
+    ('Cost', 'Purchase price (numbers only)', True, _TEXT),
+    ('Date Purchased', None, True, {
+        'dateQuestion': {
+            'includeTime': False,
+            'includeYear': True
+        }
+    }),
+    ('Location', 'Where is this item stored?', False, {
+        'choiceQuestion': {
+            'type': 'DROP_DOWN',
+            'options': [
+                {'value': "Zach's garage"},
+                {'value': "Adi's garage"}
+            ]
+        }
+    }),
+    ('Notes', 'Any additional details (optional)', False, {'textQuestion': {'paragraph': True}}),
+)
 
 def create_form_for_inventory(forms_service, spreadsheet_id):
     """Create a Google Form linked to the Inventory spreadsheet."""
@@ -91,187 +96,24 @@ def create_form_for_inventory(forms_service, spreadsheet_id):
     # Step 3: Add all form fields
     print("\n3. Adding form fields...")
     
-    # Field 1: UPC (optional text)
-    requests.append({
-        'createItem': {
-            'item': {
-                'title': 'UPC',
-                'description': 'Barcode number (optional)',
-                'questionItem': {
-                    'question': {
-                        'required': False,
-                        'textQuestion': {
-                            'paragraph': False
-                        }
-                    }
-                }
-            },
-            'location': {'index': 0}
-        }
-    })
-    
-    # Field 2: Category (required text)
-    requests.append({
-        'createItem': {
-            'item': {
-                'title': 'Category',
-                'description': 'e.g., Hoodie, Jacket, Tee, Pants, Shoes',
-                'questionItem': {
-                    'question': {
-                        'required': True,
-                        'textQuestion': {
-                            'paragraph': False
-                        }
-                    }
-                }
-            },
-            'location': {'index': 1}
-        }
-    })
-    
-    # Field 3: Brand (required text)
-    requests.append({
-        'createItem': {
-            'item': {
-                'title': 'Brand',
-                'description': 'Brand name',
-                'questionItem': {
-                    'question': {
-                        'required': True,
-                        'textQuestion': {
-                            'paragraph': False
-                        }
-                    }
-                }
-            },
-            'location': {'index': 2}
-        }
-    })
-    
-    # Field 4: Size (required dropdown)
-    requests.append({
-        'createItem': {
-            'item': {
-                'title': 'Size',
-                'questionItem': {
-                    'question': {
-                        'required': True,
-                        'choiceQuestion': {
-                            'type': 'DROP_DOWN',
-                            'options': [
-                                {'value': 'XS'},
-                                {'value': 'S'},
-                                {'value': 'M'},
-                                {'value': 'L'},
-                                {'value': 'XL'},
-                                {'value': 'XXL'}
-                            ]
+    requests.extend(
+        {
+            'createItem': {
+                'item': {
+                    'title': title,
+                    **({'description': description} if description else {}),
+                    'questionItem': {
+                        'question': {
+                            'required': required,
+                            **question
                         }
                     }
-                }
-            },
-            'location': {'index': 3}
+                },
+                'location': {'index': index}
+            }
         }
-    })
-    
-    # Field 5: Color (required text)
-    requests.append({
-        'createItem': {
-            'item': {
-                'title': 'Color',
-                'description': 'Primary color',
-                'questionItem': {
-                    'question': {
-                        'required': True,
-                        'textQuestion': {
-                            'paragraph': False
-                        }
-                    }
-                }
-            },
-            'location': {'index': 4}
-        }
-    })
-    
-    # Field 6: Cost (required text - could validate as number)
-    requests.append({
-        'createItem': {
-            'item': {
-                'title': 'Cost',
-                'description': 'Purchase price (numbers only)',
-                'questionItem': {
-                    'question': {
-                        'required': True,
-                        'textQuestion': {
-                            'paragraph': False
-                        }
-                    }
-                }
-            },
-            'location': {'index': 5}
-        }
-    })
-    
-    # Field 7: Date Purchased (date field)
-    requests.append({
-        'createItem': {
-            'item': {
-                'title': 'Date Purchased',
-                'questionItem': {
-                    'question': {
-                        'required': True,
-                        'dateQuestion': {
-                            'includeTime': False,
-                            'includeYear': True
-                        }
-                    }
-                }
-            },
-            'location': {'index': 6}
-        }
-    })
-    
-    # Field 8: Location (dropdown)
-    requests.append({
-        'createItem': {
-            'item': {
-                'title': 'Location',
-                'description': 'Where is this item stored?',
-                'questionItem': {
-                    'question': {
-                        'required': False,
-                        'choiceQuestion': {
-                            'type': 'DROP_DOWN',
-                            'options': [
-                                {'value': "Zach's garage"},
-                                {'value': "Adi's garage"}
-                            ]
-                        }
-                    }
-                }
-            },
-            'location': {'index': 7}
-        }
-    })
-    
-    # Field 9: Notes (optional paragraph)
-    requests.append({
-        'createItem': {
-            'item': {
-                'title': 'Notes',
-                'description': 'Any additional details (optional)',
-                'questionItem': {
-                    'question': {
-                        'required': False,
-                        'textQuestion': {
-                            'paragraph': True
-                        }
-                    }
-                }
-            },
-            'location': {'index': 8}
-        }
-    })
+        for index, (title, description, required, question) in enumerate(FORM_FIELDS)
+    )
     
     # Execute all requests
     forms_service.forms().batchUpdate(
@@ -312,23 +154,22 @@ function onFormSubmit(e) {
   // Get the last row (the newly added form response)
   var lastRow = sheet.getLastRow();
   
-  // Get the values from the form submission
-  var category = sheet.getRange(lastRow, 3).getValue();  // Column C
-  var brand = sheet.getRange(lastRow, 4).getValue();     // Column D
-  var size = sheet.getRange(lastRow, 5).getValue();      // Column E
-  var color = sheet.getRange(lastRow, 6).getValue();     // Column F
+  // Read the new row once (columns A-H) instead of one call per cell
+  var values = sheet.getRange(lastRow, 1, 1, 8).getValues()[0];
+  var category = values[2];  // Column C
+  var brand = values[3];     // Column D
+  var size = values[4];      // Column E
+  var color = values[5];     // Column F
   
   // Generate Item ID: Category-Brand-Size-Color-Row
   var itemId = category + "-" + brand + "-" + size + "-" + color + "-" + lastRow;
   
-  // Set the Item ID in column A
+  // Set the Item ID in column A (only this cell, so formulas elsewhere are kept)
   sheet.getRange(lastRow, 1).setValue(itemId);
   
   // Format date in column H if needed
-  var dateCell = sheet.getRange(lastRow, 8);
-  var dateValue = dateCell.getValue();
-  if (dateValue) {
-    dateCell.setNumberFormat("MM/dd/yyyy");
+  if (values[7]) {
+    sheet.getRange(lastRow, 8).setNumberFormat("MM/dd/yyyy");
   }
   
   // Status formula will auto-calculate via the formula in column I
@@ -355,32 +196,27 @@ function onFormSubmit(e) {
 
 def main():
     """Main function."""
+    parser = argparse.ArgumentParser(
+        description="Create a Google Form for adding items to the Inventory tab.")
+    parser.add_argument(
+        'spreadsheet', nargs='?',
+        help="Google Sheets URL or spreadsheet ID (prompted for if omitted)")
+    args = parser.parse_args()
+    
     print("\n=== Create Inventory Form ===\n")
     
     # Get spreadsheet ID from command line or prompt
-    if len(sys.argv) > 1:
-        spreadsheet_id = sys.argv[1]
-    else:
+    if not args.spreadsheet:
         print("Enter your Google Sheets URL or Spreadsheet ID:")
-        user_input = input("URL or ID: ").strip()
-        
-        # Extract ID from URL if needed
-        if 'docs.google.com/spreadsheets' in user_input:
-            parts = user_input.split('/d/')
-            if len(parts) > 1:
-                spreadsheet_id = parts[1].split('/')[0]
-            else:
-                print("Error: Could not parse spreadsheet ID from URL")
-                exit(1)
-        else:
-            spreadsheet_id = user_input
+    spreadsheet_id = parse_spreadsheet_id(args.spreadsheet, SCOPES)
     
     print(f"\nSpreadsheet ID: {spreadsheet_id}")
     print("\nAuthenticating...")
     
+    from googleapiclient.errors import HttpError
+    
     try:
-        creds = get_credentials()
-        forms_service = build('forms', 'v1', credentials=creds)
+        forms_service = get_service('forms', 'v1', SCOPES)
         
         form_id, response_url, form_url = create_form_for_inventory(forms_service, spreadsheet_id)
         
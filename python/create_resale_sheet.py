@@ -13,48 +13,131 @@ dependencies = [
 ///
 """
 
-import os.path
-from google.auth.transport.requests import Request
-from google.oauth2.credentials import Credentials
-from google_auth_oauthlib.flow import InstalledAppFlow
-from googleapiclient.discovery import build
-from googleapiclient.errors import HttpError
+from _sheets_common import get_service
 
 # If modifying these scopes, delete the file token.json.
-SCOPES = ['https://www.googleapis.com/auth/spreadsheets', 
-          'https://www.googleapis.com/auth/drive.file']
+SCOPES = ('https://www.googleapis.com/auth/spreadsheets', 
+          'https://www.googleapis.com/auth/drive.file')
 
-def get_credentials():
-    """Authenticate and return credentials for Google Sheets API."""
-    creds = None
-    
-    # The file token.json stores the user's access and refresh tokens
-    if os.path.exists('token.json'):
-        creds = Credentials.from_authorized_user_file('token.json', SCOPES)
-    
-    # If there are no (valid) credentials available, let the user log in
-    if not creds or not creds.valid:
-        if creds and creds.expired and creds.refresh_token:
-            creds.refresh(Request())
-        else:
-            if not os.path.exists('credentials.json'):
-                print("\nError: credentials.json not found!")
-                print("Please follow the setup instructions in README.md")
-                print("to create OAuth credentials and download them as credentials.json")
-                exit(1)
-            
-            flow = InstalledAppFlow.from_client_secrets_file(
-                'credentials.json', SCOPES)
-            creds = flow.run_local_server(port=0)
-        
-        # Save the credentials for the next run
-        with open('token.json', 'w') as token:
-            token.write(creds.to_json())
-    
-    return creds
+# Last row covered by validations, banding and the lookup formulas. This
+# matches the 1000 rows a new sheet starts with.
+MAX_ROWS = 1000
+
+# Dropdown validations: (sheet name, column index, allowed values)
+DROPDOWN_VALIDATIONS = (
+    # Size (Inventory Column E) - XS, S, M, L, XL, XXL
+    ('Inventory', 4, ('XS', 'S', 'M', 'L', 'XL', 'XXL')),
+    # Location (Inventory Column J) - Zach's garage, Adi's garage
+    ('Inventory', 9, ("Zach's garage", "Adi's garage")),
+    # Sold By (Sales Column D) - Zach, Adi
+    ('Sales', 3, ('Zach', 'Adi')),
+    # Platform (Sales Column F) - Depop, eBay, local
+    ('Sales', 5, ('Depop', 'eBay', 'local')),
+    # Shipping Status (Sales Column G)
+    ('Sales', 6, ('needs to ship', 'shipped', 'delivered', 'local pickup (no shipping)')),
+)
+
+# Validation rules don't depend on the sheet IDs, so build them once
+DROPDOWN_RULES = tuple(
+    (sheet_name, column, {
+        'condition': {
+            'type': 'ONE_OF_LIST',
+            'values': [{'userEnteredValue': value} for value in values]
+        },
+        'showCustomUi': True
+    })
+    for sheet_name, column, values in DROPDOWN_VALIDATIONS
+)
+
+# Item ID dropdown on Sales, listing the Item IDs from the Inventory tab
+ITEM_ID_RULE = {
+    'condition': {
+        'type': 'ONE_OF_RANGE',
+        'values': [
+            {'userEnteredValue': f'=Inventory!$A$2:$A${MAX_ROWS}'}
+        ]
+    },
+    'showCustomUi': True,
+    'strict': True
+}
+
+# Header row style shared by all sheets
+HEADER_CELL = {
+    'userEnteredFormat': {
+        'backgroundColor': {'red': 0.2, 'green': 0.2, 'blue': 0.2},
+        'textFormat': {
+            'foregroundColor': {'red': 1.0, 'green': 1.0, 'blue': 1.0},
+            'fontSize': 10,
+            'bold': True
+        },
+        'horizontalAlignment': 'CENTER'
+    }
+}
+
+# Alternating row colors shared by all sheets; the even rows (starting with
+# row 2, the first band) are shaded
+ROW_BANDING = {
+    'headerColor': {'red': 0.2, 'green': 0.2, 'blue': 0.2},
+    'firstBandColor': {'red': 0.95, 'green': 0.95, 'blue': 0.95},
+    'secondBandColor': {'red': 1.0, 'green': 1.0, 'blue': 1.0}
+}
+
+# Column widths per sheet: (start index, end index, pixel size)
+COLUMN_WIDTHS = {
+    'Inventory': (
+        (0, 1, 150),   # Item ID
+        (1, 2, 120),   # UPC
+        (2, 7, 100),   # Category-Color
+        (7, 8, 120),   # Date Purchased
+        (8, 9, 100),   # Status
+        (9, 10, 150),  # Location
+        (10, 11, 200), # Notes
+    ),
+    'Sales': (
+        (0, 1, 150),   # Item ID
+        (1, 3, 100),   # Sale Price, Date Sold
+        (3, 7, 120),   # Sold By-Shipping Status
+        (7, 8, 150),   # Tracking Number
+        (8, 9, 200),   # Notes
+    ),
+    'Shipping Dashboard': (
+        (0, 1, 150),   # Item ID
+        (1, 8, 100),   # Rest
+        (8, 9, 130),   # Shipping Status
+        (9, 10, 150),  # Tracking Number
+    ),
+}
+
+# Progress and summary output, each written with a single print()
+DONE_MESSAGE = "\n".join([
+    "✓ Inventory tab configured",
+    "✓ Sales tab configured",
+    "✓ Shipping Dashboard configured",
+    "✓ Data validations applied",
+    "✓ Formatting applied",
+    "✓ Inventory filters created (In Stock, Sold, All Statuses)",
+    "✓ Shipping filter created (Outstanding Shipments)",
+])
+
+SUCCESS_MESSAGE = "\n".join([
+    "\n" + "="*60,
+    "SUCCESS! Your spreadsheet is ready!",
+    "="*60,
+    "\nSpreadsheet URL:\n{spreadsheet_url}",
+    "\nYou can now:",
+    "1. Add items to Inventory tab (auto-generates Item IDs)",
+    "2. Record sales in Sales tab (Item ID dropdown)",
+    "3. Use Inventory filters: 'In Stock', 'Sold', 'All Statuses'",
+    "4. Monitor shipments in Shipping Dashboard tab",
+    "5. Status auto-updates when items are sold",
+    "\n",
+])
 
 def create_spreadsheet(service):
-    """Create a new spreadsheet with 3 sheets."""
+    """Create a new spreadsheet with 3 sheets.
+    
+    Returns the spreadsheet ID and a dict mapping sheet titles to sheet IDs.
+    """
     spreadsheet = {
         'properties': {
             'title': 'Clothing Resale Business'
@@ -72,10 +155,35 @@ def create_spreadsheet(service):
     print(f"Created spreadsheet: {spreadsheet['properties']['title']}")
     print(f"Spreadsheet ID: {spreadsheet_id}")
     
-    return spreadsheet_id
+    # The create response already includes the new sheets' IDs
+    sheet_ids = {
+        sheet['properties']['title']: sheet['properties']['sheetId']
+        for sheet in spreadsheet['sheets']
+    }
+    
+    return spreadsheet_id, sheet_ids
+
+def cell_value(value):
+    """Return the userEnteredValue for a header string or a formula."""
+    if value.startswith('='):
+        return {'formulaValue': value}
+    return {'stringValue': value}
 
-def setup_inventory_tab(service, spreadsheet_id):
-    """Set up the Inventory tab with headers and formulas."""
+def update_cells(sheet_id, row, column, rows):
+    """Return an updateCells request writing `rows` starting at (row, column)."""
+    return {
+        'updateCells': {
+            'rows': [
+                {'values': [{'userEnteredValue': cell_value(value)} for value in values]}
+                for values in rows
+            ],
+            'fields': 'userEnteredValue',
+            'start': {'sheetId': sheet_id, 'rowIndex': row, 'columnIndex': column}
+        }
+    }
+
+def setup_inventory_tab(sheet_ids):
+    """Return the requests that write headers and formulas to the Inventory tab."""
     
     # Define headers - consolidated from old Purchases + Inventory
     headers = [
@@ -83,38 +191,24 @@ def setup_inventory_tab(service, spreadsheet_id):
          'Cost', 'Date Purchased', 'Status', 'Location', 'Notes']
     ]
     
-    # Write headers
-    service.spreadsheets().values().update(
-        spreadsheetId=spreadsheet_id,
-        range='Inventory!A1:K1',
-        valueInputOption='RAW',
-        body={'values': headers}
-    ).execute()
-    
     # Add formula for Item ID generation in A2
     formula_a2 = '=IF(AND(C2<>"", D2<>"", E2<>"", F2<>""), CONCATENATE(C2,"-",D2,"-",E2,"-",F2,"-",ROW()), "")'
     
-    # Add formula for Status in I2 (checks if Item ID exists in Sales tab)
-    formula_i2 = '=IF(A2="", "", IF(COUNTIF(Sales!$A:$A, A2) > 0, "Sold", "In Stock"))'
+    # Add formula for Status in I2 (checks if Item ID exists in Sales tab).
+    # This stays a per-row formula: the inventory form's Apps Script copies
+    # it to each new row, replacing A2 with that row's cell. The MATCH is
+    # bounded to the Sales rows instead of a COUNTIF over the whole column.
+    formula_i2 = f'=IF(A2="", "", IF(ISNUMBER(MATCH(A2, Sales!A$2:A${MAX_ROWS}, 0)), "Sold", "In Stock"))'
     
-    service.spreadsheets().values().update(
-        spreadsheetId=spreadsheet_id,
-        range='Inventory!A2',
-        valueInputOption='USER_ENTERED',
-        body={'values': [[formula_a2]]}
-    ).execute()
-    
-    service.spreadsheets().values().update(
-        spreadsheetId=spreadsheet_id,
-        range='Inventory!I2',
-        valueInputOption='USER_ENTERED',
-        body={'values': [[formula_i2]]}
-    ).execute()
-    
-    print("✓ Inventory tab configured")
+    inventory_sheet_id = sheet_ids['Inventory']
+    return [
+        update_cells(inventory_sheet_id, 0, 0, headers),
+        update_cells(inventory_sheet_id, 1, 0, [[formula_a2]]),  # A2
+        update_cells(inventory_sheet_id, 1, 8, [[formula_i2]]),  # I2
+    ]
 
-def setup_sales_tab(service, spreadsheet_id):
-    """Set up the Sales tab with headers."""
+def setup_sales_tab(sheet_ids):
+    """Return the requests that write headers to the Sales tab."""
     
     # Define headers
     headers = [
@@ -122,19 +216,13 @@ def setup_sales_tab(service, spreadsheet_id):
          'Platform', 'Shipping Status', 'Tracking Number', 'Notes']
     ]
     
-    # Write headers
-    service.spreadsheets().values().update(
-        spreadsheetId=spreadsheet_id,
-        range='Sales!A1:I1',
-        valueInputOption='RAW',
-        body={'values': headers}
-    ).execute()
-    
-    print("✓ Sales tab configured")
+    return [
+        update_cells(sheet_ids['Sales'], 0, 0, headers),
+    ]
 
 
-def setup_shipping_dashboard(service, spreadsheet_id):
-    """Set up the Shipping Dashboard with headers and query formula."""
+def setup_shipping_dashboard(sheet_ids):
+    """Return the requests that write headers and the lookup formula to the Shipping Dashboard."""
     
     # Define headers
     headers = [
@@ -142,212 +230,81 @@ def setup_shipping_dashboard(service, spreadsheet_id):
          'Platform', 'Sale Price', 'Shipping Status', 'Tracking Number']
     ]
     
-    # Write headers
-    service.spreadsheets().values().update(
-        spreadsheetId=spreadsheet_id,
-        range='Shipping Dashboard!A1:J1',
-        valueInputOption='RAW',
-        body={'values': headers}
-    ).execute()
-    
-    # Create a QUERY formula that joins Sales with Inventory data
-    # This pulls all sales and looks up the product details from Inventory
-    query_formula = '''=QUERY(
-  ARRAYFORMULA(
-    IF(Sales!A2:A<>"",
-      {
-        Sales!A2:A,
-        IFERROR(VLOOKUP(Sales!A2:A, Inventory!A:K, 3, FALSE), ""),
-        IFERROR(VLOOKUP(Sales!A2:A, Inventory!A:K, 4, FALSE), ""),
-        IFERROR(VLOOKUP(Sales!A2:A, Inventory!A:K, 5, FALSE), ""),
-        IFERROR(VLOOKUP(Sales!A2:A, Inventory!A:K, 6, FALSE), ""),
-        Sales!E2:E,
-        Sales!F2:F,
-        Sales!B2:B,
-        Sales!G2:G,
-        Sales!H2:H
-      },
-    )
-  ),
-  "WHERE Col1 IS NOT NULL"
-)'''
-    
-    service.spreadsheets().values().update(
-        spreadsheetId=spreadsheet_id,
-        range='Shipping Dashboard!A2',
-        valueInputOption='USER_ENTERED',
-        body={'values': [[query_formula]]}
-    ).execute()
-    
-    print("✓ Shipping Dashboard configured")
-
-def apply_data_validations(service, spreadsheet_id, sheet_ids):
-    """Apply dropdown data validations to appropriate columns."""
+    # Create a formula that joins Sales with Inventory data
+    # This pulls all sales and looks up the product details from Inventory.
+    # One VLOOKUP returns Category, Brand, Size and Color (columns 3-6) per
+    # row, and all ranges stop at row MAX_ROWS like the data validations.
+    # FILTER drops the empty Sales rows; IFERROR leaves the dashboard blank
+    # instead of showing an error while there are no sales yet.
+    dashboard_formula = f'''=IFERROR(ARRAYFORMULA(
+  FILTER(
+    {{
+      Sales!A2:A{MAX_ROWS},
+      IFERROR(VLOOKUP(Sales!A2:A{MAX_ROWS}, Inventory!A2:F{MAX_ROWS}, {{3, 4, 5, 6}}, FALSE), ""),
+      Sales!E2:E{MAX_ROWS},
+      Sales!F2:F{MAX_ROWS},
+      Sales!B2:B{MAX_ROWS},
+      Sales!G2:G{MAX_ROWS},
+      Sales!H2:H{MAX_ROWS}
+    }},
+    Sales!A2:A{MAX_ROWS}<>""
+  )
+), "")'''
     
-    requests = []
-    
-    # Inventory sheet validations
-    inventory_sheet_id = sheet_ids['Inventory']
-    
-    # Size validation (Column E - index 4) - XS, S, M, L, XL, XXL
-    requests.append({
-        'setDataValidation': {
-            'range': {
-                'sheetId': inventory_sheet_id,
-                'startRowIndex': 1,
-                'endRowIndex': 1000,
-                'startColumnIndex': 4,
-                'endColumnIndex': 5
-            },
-            'rule': {
-                'condition': {
-                    'type': 'ONE_OF_LIST',
-                    'values': [
-                        {'userEnteredValue': 'XS'},
-                        {'userEnteredValue': 'S'},
-                        {'userEnteredValue': 'M'},
-                        {'userEnteredValue': 'L'},
-                        {'userEnteredValue': 'XL'},
-                        {'userEnteredValue': 'XXL'}
-                    ]
-                },
-                'showCustomUi': True
-            }
-        }
-    })
+    shipping_sheet_id = sheet_ids['Shipping Dashboard']
+    return [
+        update_cells(shipping_sheet_id, 0, 0, headers),
+        update_cells(shipping_sheet_id, 1, 0, [[dashboard_formula]]),  # A2
+    ]
+
+def apply_data_validations(sheet_ids):
+    """Return the requests that add dropdown data validations to appropriate columns."""
     
-    # Location validation (Column J - index 9) - Zach's garage, Adi's garage
-    requests.append({
-        'setDataValidation': {
-            'range': {
-                'sheetId': inventory_sheet_id,
-                'startRowIndex': 1,
-                'endRowIndex': 1000,
-                'startColumnIndex': 9,
-                'endColumnIndex': 10
-            },
-            'rule': {
-                'condition': {
-                    'type': 'ONE_OF_LIST',
-                    'values': [
-                        {'userEnteredValue': "Zach's garage"},
-                        {'userEnteredValue': "Adi's garage"}
-                    ]
+    # Fixed-list dropdowns, one request per entry in DROPDOWN_RULES
+    requests = [
+        {
+            'setDataValidation': {
+                'range': {
+                    'sheetId': sheet_ids[sheet_name],
+                    'startRowIndex': 1,
+                    'endRowIndex': MAX_ROWS,
+                    'startColumnIndex': column,
+                    'endColumnIndex': column + 1
                 },
-                'showCustomUi': True
+                'rule': rule
             }
         }
-    })
-    
-    # Sales sheet validations
-    sales_sheet_id = sheet_ids['Sales']
+        for sheet_name, column, rule in DROPDOWN_RULES
+    ]
     
-    # Item ID validation (Column A - index 0) - Reference Inventory Item IDs
+    # Item ID validation (Sales Column A - index 0) - Reference Inventory Item IDs
     requests.append({
         'setDataValidation': {
             'range': {
-                'sheetId': sales_sheet_id,
+                'sheetId': sheet_ids['Sales'],
                 'startRowIndex': 1,
-                'endRowIndex': 1000,
+                'endRowIndex': MAX_ROWS,
                 'startColumnIndex': 0,
                 'endColumnIndex': 1
             },
-            'rule': {
-                'condition': {
-                    'type': 'ONE_OF_RANGE',
-                    'values': [
-                        {'userEnteredValue': '=Inventory!$A$2:$A$1000'}
-                    ]
-                },
-                'showCustomUi': True,
-                'strict': True
-            }
-        }
-    })
-    
-    # Sold By validation (Column D - index 3) - Zach, Adi
-    requests.append({
-        'setDataValidation': {
-            'range': {
-                'sheetId': sales_sheet_id,
-                'startRowIndex': 1,
-                'endRowIndex': 1000,
-                'startColumnIndex': 3,
-                'endColumnIndex': 4
-            },
-            'rule': {
-                'condition': {
-                    'type': 'ONE_OF_LIST',
-                    'values': [
-                        {'userEnteredValue': 'Zach'},
-                        {'userEnteredValue': 'Adi'}
-                    ]
-                },
-                'showCustomUi': True
-            }
-        }
-    })
-    
-    # Platform validation (Column F - index 5) - Depop, eBay, local
-    requests.append({
-        'setDataValidation': {
-            'range': {
-                'sheetId': sales_sheet_id,
-                'startRowIndex': 1,
-                'endRowIndex': 1000,
-                'startColumnIndex': 5,
-                'endColumnIndex': 6
-            },
-            'rule': {
-                'condition': {
-                    'type': 'ONE_OF_LIST',
-                    'values': [
-                        {'userEnteredValue': 'Depop'},
-                        {'userEnteredValue': 'eBay'},
-                        {'userEnteredValue': 'local'}
-                    ]
-                },
-                'showCustomUi': True
-            }
-        }
-    })
-    
-    # Shipping Status validation (Column G - index 6)
-    requests.append({
-        'setDataValidation': {
-            'range': {
-                'sheetId': sales_sheet_id,
-                'startRowIndex': 1,
-                'endRowIndex': 1000,
-                'startColumnIndex': 6,
-                'endColumnIndex': 7
-            },
-            'rule': {
-                'condition': {
-                    'type': 'ONE_OF_LIST',
-                    'values': [
-                        {'userEnteredValue': 'needs to ship'},
-                        {'userEnteredValue': 'shipped'},
-                        {'userEnteredValue': 'delivered'},
-                        {'userEnteredValue': 'local pickup (no shipping)'}
-                    ]
-                },
-                'showCustomUi': True
-            }
+            'rule': ITEM_ID_RULE
         }
     })
     
-    # Execute all validation requests
-    body = {'requests': requests}
-    service.spreadsheets().batchUpdate(
-        spreadsheetId=spreadsheet_id,
-        body=body
-    ).execute()
-    
-    print("✓ Data validations applied")
+    return requests
 
-def apply_formatting(service, spreadsheet_id, sheet_ids):
-    """Apply formatting to all sheets."""
+def merge_column_widths(widths):
+    """Merge adjacent (start, end, pixel size) column runs of the same width."""
+    merged = []
+    for start, end, pixel_size in widths:
+        if merged and merged[-1][1] == start and merged[-1][2] == pixel_size:
+            merged[-1] = (merged[-1][0], end, pixel_size)
+        else:
+            merged.append((start, end, pixel_size))
+    return merged
+
+def apply_formatting(sheet_ids):
+    """Return the requests that format all sheets."""
     
     requests = []
     
@@ -361,84 +318,46 @@ def apply_formatting(service, spreadsheet_id, sheet_ids):
                     'startRowIndex': 0,
                     'endRowIndex': 1
                 },
-                'cell': {
-                    'userEnteredFormat': {
-                        'backgroundColor': {'red': 0.2, 'green': 0.2, 'blue': 0.2},
-                        'textFormat': {
-                            'foregroundColor': {'red': 1.0, 'green': 1.0, 'blue': 1.0},
-                            'fontSize': 10,
-                            'bold': True
-                        },
-                        'horizontalAlignment': 'CENTER'
-                    }
-                },
+                'cell': HEADER_CELL,
                 'fields': 'userEnteredFormat(backgroundColor,textFormat,horizontalAlignment)'
             }
         })
         
-        # Add alternating row colors
+        # Add alternating row colors. Banding is a stored style, so unlike a
+        # conditional format formula it isn't re-evaluated on every recalc.
         requests.append({
-            'addConditionalFormatRule': {
-                'rule': {
-                    'ranges': [{
+            'addBanding': {
+                'bandedRange': {
+                    'range': {
                         'sheetId': sheet_id,
-                        'startRowIndex': 1,
-                        'endRowIndex': 1000
-                    }],
-                    'booleanRule': {
-                        'condition': {
-                            'type': 'CUSTOM_FORMULA',
-                            'values': [{'userEnteredValue': '=ISEVEN(ROW())'}]
-                        },
-                        'format': {
-                            'backgroundColor': {'red': 0.95, 'green': 0.95, 'blue': 0.95}
-                        }
-                    }
-                },
-                'index': 0
+                        'startRowIndex': 0,
+                        'endRowIndex': MAX_ROWS
+                    },
+                    'rowProperties': ROW_BANDING
+                }
             }
         })
     
     # Set column widths for better readability
-    # Inventory sheet
-    requests.extend([
-        {'updateDimensionProperties': {'range': {'sheetId': sheet_ids['Inventory'], 'dimension': 'COLUMNS', 'startIndex': 0, 'endIndex': 1}, 'properties': {'pixelSize': 150}, 'fields': 'pixelSize'}},  # Item ID
-        {'updateDimensionProperties': {'range': {'sheetId': sheet_ids['Inventory'], 'dimension': 'COLUMNS', 'startIndex': 1, 'endIndex': 2}, 'properties': {'pixelSize': 120}, 'fields': 'pixelSize'}},  # UPC
-        {'updateDimensionProperties': {'range': {'sheetId': sheet_ids['Inventory'], 'dimension': 'COLUMNS', 'startIndex': 2, 'endIndex': 7}, 'properties': {'pixelSize': 100}, 'fields': 'pixelSize'}},  # Category-Color
-        {'updateDimensionProperties': {'range': {'sheetId': sheet_ids['Inventory'], 'dimension': 'COLUMNS', 'startIndex': 7, 'endIndex': 8}, 'properties': {'pixelSize': 120}, 'fields': 'pixelSize'}},  # Date Purchased
-        {'updateDimensionProperties': {'range': {'sheetId': sheet_ids['Inventory'], 'dimension': 'COLUMNS', 'startIndex': 8, 'endIndex': 9}, 'properties': {'pixelSize': 100}, 'fields': 'pixelSize'}},  # Status
-        {'updateDimensionProperties': {'range': {'sheetId': sheet_ids['Inventory'], 'dimension': 'COLUMNS', 'startIndex': 9, 'endIndex': 10}, 'properties': {'pixelSize': 150}, 'fields': 'pixelSize'}},  # Location
-        {'updateDimensionProperties': {'range': {'sheetId': sheet_ids['Inventory'], 'dimension': 'COLUMNS', 'startIndex': 10, 'endIndex': 11}, 'properties': {'pixelSize': 200}, 'fields': 'pixelSize'}},  # Notes
-    ])
-    
-    # Sales sheet
-    requests.extend([
-        {'updateDimensionProperties': {'range': {'sheetId': sheet_ids['Sales'], 'dimension': 'COLUMNS', 'startIndex': 0, 'endIndex': 1}, 'properties': {'pixelSize': 150}, 'fields': 'pixelSize'}},  # Item ID
-        {'updateDimensionProperties': {'range': {'sheetId': sheet_ids['Sales'], 'dimension': 'COLUMNS', 'startIndex': 1, 'endIndex': 3}, 'properties': {'pixelSize': 100}, 'fields': 'pixelSize'}},  # Sale Price, Date Sold
-        {'updateDimensionProperties': {'range': {'sheetId': sheet_ids['Sales'], 'dimension': 'COLUMNS', 'startIndex': 3, 'endIndex': 7}, 'properties': {'pixelSize': 120}, 'fields': 'pixelSize'}},  # Sold By-Shipping Status
-        {'updateDimensionProperties': {'range': {'sheetId': sheet_ids['Sales'], 'dimension': 'COLUMNS', 'startIndex': 7, 'endIndex': 8}, 'properties': {'pixelSize': 150}, 'fields': 'pixelSize'}},  # Tracking Number
-        {'updateDimensionProperties': {'range': {'sheetId': sheet_ids['Sales'], 'dimension': 'COLUMNS', 'startIndex': 8, 'endIndex': 9}, 'properties': {'pixelSize': 200}, 'fields': 'pixelSize'}},  # Notes
-    ])
-    
-    # Shipping Dashboard
-    requests.extend([
-        {'updateDimensionProperties': {'range': {'sheetId': sheet_ids['Shipping Dashboard'], 'dimension': 'COLUMNS', 'startIndex': 0, 'endIndex': 1}, 'properties': {'pixelSize': 150}, 'fields': 'pixelSize'}},  # Item ID
-        {'updateDimensionProperties': {'range': {'sheetId': sheet_ids['Shipping Dashboard'], 'dimension': 'COLUMNS', 'startIndex': 1, 'endIndex': 8}, 'properties': {'pixelSize': 100}, 'fields': 'pixelSize'}},  # Rest
-        {'updateDimensionProperties': {'range': {'sheetId': sheet_ids['Shipping Dashboard'], 'dimension': 'COLUMNS', 'startIndex': 8, 'endIndex': 9}, 'properties': {'pixelSize': 130}, 'fields': 'pixelSize'}},  # Shipping Status
-        {'updateDimensionProperties': {'range': {'sheetId': sheet_ids['Shipping Dashboard'], 'dimension': 'COLUMNS', 'startIndex': 9, 'endIndex': 10}, 'properties': {'pixelSize': 150}, 'fields': 'pixelSize'}},  # Tracking Number
-    ])
-    
-    # Execute all formatting requests
-    body = {'requests': requests}
-    service.spreadsheets().batchUpdate(
-        spreadsheetId=spreadsheet_id,
-        body=body
-    ).execute()
-    
-    print("✓ Formatting applied")
+    for sheet_name, widths in COLUMN_WIDTHS.items():
+        for start, end, pixel_size in merge_column_widths(widths):
+            requests.append({
+                'updateDimensionProperties': {
+                    'range': {
+                        'sheetId': sheet_ids[sheet_name],
+                        'dimension': 'COLUMNS',
+                        'startIndex': start,
+                        'endIndex': end
+                    },
+                    'properties': {'pixelSize': pixel_size},
+                    'fields': 'pixelSize'
+                }
+            })
+    
+    return requests
 
-def create_inventory_filters(service, spreadsheet_id, sheet_ids):
-    """Create filter views on Inventory tab."""
+def create_inventory_filters(sheet_ids):
+    """Return the requests that create filter views on Inventory tab."""
     
     inventory_sheet_id = sheet_ids['Inventory']
     
@@ -500,16 +419,10 @@ def create_inventory_filters(service, spreadsheet_id, sheet_ids):
         }
     })
     
-    body = {'requests': requests}
-    service.spreadsheets().batchUpdate(
-        spreadsheetId=spreadsheet_id,
-        body=body
-    ).execute()
-    
-    print("✓ Inventory filters created (In Stock, Sold, All Statuses)")
+    return requests
 
-def create_shipping_filter(service, spreadsheet_id, sheet_ids):
-    """Create a filter view on Shipping Dashboard for outstanding shipments."""
+def create_shipping_filter(sheet_ids):
+    """Return the requests that create a filter view on Shipping Dashboard for outstanding shipments."""
     
     shipping_sheet_id = sheet_ids['Shipping Dashboard']
     
@@ -538,76 +451,46 @@ def create_shipping_filter(service, spreadsheet_id, sheet_ids):
         }
     }
     
-    body = {'requests': [request]}
-    service.spreadsheets().batchUpdate(
-        spreadsheetId=spreadsheet_id,
-        body=body
-    ).execute()
-    
-    print("✓ Shipping filter created (Outstanding Shipments)")
-
-def get_sheet_ids(service, spreadsheet_id):
-    """Get the sheet IDs for all sheets in the spreadsheet."""
-    sheet_metadata = service.spreadsheets().get(spreadsheetId=spreadsheet_id).execute()
-    sheets = sheet_metadata.get('sheets', [])
-    
-    sheet_ids = {}
-    for sheet in sheets:
-        title = sheet['properties']['title']
-        sheet_id = sheet['properties']['sheetId']
-        sheet_ids[title] = sheet_id
-    
-    return sheet_ids
+    return [request]
 
 def main():
     """Main function to create and configure the spreadsheet."""
     print("\n=== Clothing Resale Business - Google Sheet Creator ===\n")
     
+    # Imported here so the Google client libraries only load when needed
+    from googleapiclient.errors import HttpError
+    
     try:
         # Authenticate
         print("Authenticating with Google Sheets API...")
-        creds = get_credentials()
-        service = build('sheets', 'v4', credentials=creds)
+        service = get_service('sheets', 'v4', SCOPES)
         
         # Create spreadsheet
         print("\nCreating spreadsheet...")
-        spreadsheet_id = create_spreadsheet(service)
+        spreadsheet_id, sheet_ids = create_spreadsheet(service)
         
-        # Get sheet IDs
-        sheet_ids = get_sheet_ids(service, spreadsheet_id)
-        
-        # Set up each tab
+        # Write headers and formulas, then apply data validations, formatting
+        # and filter views, all in a single request
         print("\nConfiguring tabs...")
-        setup_inventory_tab(service, spreadsheet_id)
-        setup_sales_tab(service, spreadsheet_id)
-        setup_shipping_dashboard(service, spreadsheet_id)
-        
-        # Apply data validations
-        print("\nApplying data validations...")
-        apply_data_validations(service, spreadsheet_id, sheet_ids)
-        
-        # Apply formatting
-        print("\nApplying formatting...")
-        apply_formatting(service, spreadsheet_id, sheet_ids)
+        requests = (
+            setup_inventory_tab(sheet_ids)
+            + setup_sales_tab(sheet_ids)
+            + setup_shipping_dashboard(sheet_ids)
+            + apply_data_validations(sheet_ids)
+            + apply_formatting(sheet_ids)
+            + create_inventory_filters(sheet_ids)
+            + create_shipping_filter(sheet_ids)
+        )
+        service.spreadsheets().batchUpdate(
+            spreadsheetId=spreadsheet_id,
+            body={'requests': requests}
+        ).execute()
         
-        # Create filter views
-        print("\nCreating filter views...")
-        create_inventory_filters(service, spreadsheet_id, sheet_ids)
-        create_shipping_filter(service, spreadsheet_id, sheet_ids)
+        print(DONE_MESSAGE)
         
         # Success!
         spreadsheet_url = f"https://docs.google.com/spreadsheets/d/{spreadsheet_id}"
-        print("\n" + "="*60)
-        print("SUCCESS! Your spreadsheet is ready!")
-        print("="*60)
-        print(f"\nSpreadsheet URL:\n{spreadsheet_url}")
-        print("\nYou can now:")
-        print("1. Add items to Inventory tab (auto-generates Item IDs)")
-        print("2. Record sales in Sales tab (Item ID dropdown)")
-        print("3. Use Inventory filters: 'In Stock', 'Sold', 'All Statuses'")
-        print("4. Monitor shipments in Shipping Dashboard tab")
-        print("5. Status auto-updates when items are sold")
-        print("\n")
+        print(SUCCESS_MESSAGE.format(spreadsheet_url=spreadsheet_url))
         
     except HttpError as err:
         print(f"\nError: {err}")
@@ -14,52 +14,54 @@ dependencies = [
 ///
 """
 
-import os.path
-import sys
-from google.auth.transport.requests import Request
-from google.oauth2.credentials import Credentials
-from google_auth_oauthlib.flow import InstalledAppFlow
-from googleapiclient.discovery import build
-from googleapiclient.errors import HttpError
+import argparse
+from _sheets_common import NUM_RETRIES, get_service, get_sheet_ids, parse_spreadsheet_id
 
-SCOPES = ['https://www.googleapis.com/auth/spreadsheets']
+SCOPES = ('https://www.googleapis.com/auth/spreadsheets',)
 
-def get_credentials():
-    """Authenticate and return credentials for Google Sheets API."""
-    creds = None
-    
-    if os.path.exists('token.json'):
-        creds = Credentials.from_authorized_user_file('token.json', SCOPES)
-    
-    if not creds or not creds.valid:
-        if creds and creds.expired and creds.refresh_token:
-            creds.refresh(Request())
-        else:
-            if not os.path.exists('credentials.json'):
-                print("\nError: credentials.json not found!")
-                exit(1)
-            
-            flow = InstalledAppFlow.from_client_secrets_file(
-                'credentials.json', SCOPES)
-            creds = flow.run_local_server(port=0)
-        
-        with open('token.json', 'w') as token:
-            token.write(creds.to_json())
-    
-    return creds
+# Shipping Dashboard formula: every sale joined with its Inventory details
+# (Inventory is A-L here, with Condition still in column I)
+SHIPPING_DASHBOARD_FORMULA = '''=QUERY(
+  ARRAYFORMULA(
+    IF(Sales!A2:A<>"",
+      {
+        Sales!A2:A,
+        IFERROR(VLOOKUP(Sales!A2:A, Inventory!A:L, 3, FALSE), ""),
+        IFERROR(VLOOKUP(Sales!A2:A, Inventory!A:L, 4, FALSE), ""),
+        IFERROR(VLOOKUP(Sales!A2:A, Inventory!A:L, 5, FALSE), ""),
+        IFERROR(VLOOKUP(Sales!A2:A, Inventory!A:L, 6, FALSE), ""),
+        Sales!E2:E,
+        Sales!F2:F,
+        Sales!B2:B,
+        Sales!G2:G,
+        Sales!H2:H
+      },
+    )
+  ),
+  "WHERE Col1 IS NOT NULL"
+)'''
 
-def get_sheet_ids(service, spreadsheet_id):
-    """Get the sheet IDs for all sheets in the spreadsheet."""
-    sheet_metadata = service.spreadsheets().get(spreadsheetId=spreadsheet_id).execute()
-    sheets = sheet_metadata.get('sheets', [])
-    
-    sheet_ids = {}
-    for sheet in sheets:
-        title = sheet['properties']['title']
-        sheet_id = sheet['properties']['sheetId']
-        sheet_ids[title] = sheet_id
-    
-    return sheet_ids
+# Inventory dropdown validations: (column index, allowed values)
+INVENTORY_DROPDOWNS = (
+    # Size (Column E)
+    (4, ('XS', 'S', 'M', 'L', 'XL', 'XXL')),
+    # Condition (Column I)
+    (8, ('New', 'Like New', 'Good', 'Fair')),
+    # Location (Column K)
+    (10, ("Zach's garage", "Adi's garage")),
+)
+
+# Validation rules don't depend on the sheet IDs, so build them once
+INVENTORY_DROPDOWN_RULES = tuple(
+    (column, {
+        'condition': {
+            'type': 'ONE_OF_LIST',
+            'values': [{'userEnteredValue': value} for value in values]
+        },
+        'showCustomUi': True
+    })
+    for column, values in INVENTORY_DROPDOWNS
+)
 
 def migrate_spreadsheet(service, spreadsheet_id):
     """Migrate the spreadsheet to consolidated structure."""
@@ -67,7 +69,9 @@ def migrate_spreadsheet(service, spreadsheet_id):
     print("\n=== Migration Steps ===\n")
     
     # Get sheet IDs
-    sheet_ids = get_sheet_ids(service, spreadsheet_id)
+    sheet_ids, sheets = get_sheet_ids(
+        service, spreadsheet_id,
+        fields='sheets.properties(sheetId,title,gridProperties.rowCount)')
     
     if 'Purchases' not in sheet_ids:
         print("✓ No Purchases tab found - already migrated or doesn't exist")
@@ -80,14 +84,28 @@ def migrate_spreadsheet(service, spreadsheet_id):
     purchases_sheet_id = sheet_ids['Purchases']
     inventory_sheet_id = sheet_ids['Inventory']
     
-    # Step 1: Read existing Purchases data
+    # Step 1: Read existing Purchases data, up to the last row of the tab
     print("1. Reading data from Purchases tab...")
-    purchases_data = service.spreadsheets().values().get(
-        spreadsheetId=spreadsheet_id,
-        range='Purchases!A2:J1000'
-    ).execute()
+    # Only grid sheets have gridProperties; Purchases is one, but chart or
+    # image sheets elsewhere in the spreadsheet are not
+    last_row = next(
+        sheet['properties'].get('gridProperties', {}).get('rowCount', 0)
+        for sheet in sheets
+        if sheet['properties']['title'] == 'Purchases'
+    )
+    
+    # A grid with only a header row has no data; reading A2:J1 would be
+    # taken as A1:J2 and pull the header in as an item
+    if last_row < 2:
+        purchases_rows = []
+    else:
+        purchases_data = service.spreadsheets().values().get(
+            spreadsheetId=spreadsheet_id,
+            range=f"Purchases!A2:J{last_row}",
+            fields='values'
+        ).execute(num_retries=NUM_RETRIES)
+        purchases_rows = purchases_data.get('values', [])
     
-    purchases_rows = purchases_data.get('values', [])
     print(f"   Found {len(purchases_rows)} items in Purchases")
     
     # Step 2: Update Inventory tab structure
@@ -99,40 +117,39 @@ def migrate_spreadsheet(service, spreadsheet_id):
          'Cost', 'Date Purchased', 'Condition', 'Status', 'Location', 'Notes']
     ]
     
-    service.spreadsheets().values().update(
-        spreadsheetId=spreadsheet_id,
-        range='Inventory!A1:L1',
-        valueInputOption='RAW',
-        body={'values': new_headers}
-    ).execute()
+    # Headers and migrated rows are written as-is (RAW); the formulas below
+    # are parsed (USER_ENTERED). Each group goes out in one batchUpdate.
+    raw_data = [{'range': 'Inventory!A1:L1', 'values': new_headers}]
     
     # Step 3: Copy data from Purchases to Inventory (if there's data)
     if purchases_rows:
         print("\n3. Migrating data from Purchases to Inventory...")
         
         # Transform data: Purchases cols A-J become Inventory cols A-I, then J (Status), K (Location), L (Notes)
-        migrated_rows = []
-        for row in purchases_rows:
-            # Pad row to have at least 10 columns
-            while len(row) < 10:
-                row.append('')
-            
-            # Rearrange: A-I from Purchases (A-I), then Status (empty), Location (empty), Notes (J from Purchases)
-            migrated_row = row[0:9] + ['', '', row[9] if len(row) > 9 else '']
-            migrated_rows.append(migrated_row)
+        # Rows are padded to 10 columns, since the API omits trailing empty cells.
+        # Rearrange: A-I from Purchases (A-I), then Status (empty), Location (empty), Notes (J from Purchases)
+        migrated_rows = [
+            padded[0:9] + ['', '', padded[9]]
+            for padded in ((row + [''] * 10)[:10] for row in purchases_rows)
+        ]
         
-        # Write migrated data
-        service.spreadsheets().values().update(
-            spreadsheetId=spreadsheet_id,
-            range='Inventory!A2',
-            valueInputOption='RAW',
-            body={'values': migrated_rows}
-        ).execute()
+        raw_data.append({
+            'range': f'Inventory!A2:L{len(migrated_rows) + 1}',
+            'majorDimension': 'ROWS',
+            'values': migrated_rows
+        })
         
         print(f"   Migrated {len(migrated_rows)} items to new Inventory structure")
     else:
         print("\n3. No data to migrate (Purchases tab is empty)")
     
+    # Write headers and migrated data
+    service.spreadsheets().values().batchUpdate(
+        spreadsheetId=spreadsheet_id,
+        body={'valueInputOption': 'RAW', 'data': raw_data},
+        fields='totalUpdatedCells'
+    ).execute(num_retries=NUM_RETRIES)
+    
     # Step 4: Add formulas
     print("\n4. Adding formulas to Inventory...")
     
@@ -142,146 +159,55 @@ def migrate_spreadsheet(service, spreadsheet_id):
     # Status formula in J2
     formula_j2 = '=IF(A2="", "", IF(COUNTIF(Sales!$A:$A, A2) > 0, "Sold", "In Stock"))'
     
-    service.spreadsheets().values().update(
-        spreadsheetId=spreadsheet_id,
-        range='Inventory!A2',
-        valueInputOption='USER_ENTERED',
-        body={'values': [[formula_a2]]}
-    ).execute()
-    
-    service.spreadsheets().values().update(
-        spreadsheetId=spreadsheet_id,
-        range='Inventory!J2',
-        valueInputOption='USER_ENTERED',
-        body={'values': [[formula_j2]]}
-    ).execute()
+    formula_data = [
+        {'range': 'Inventory!A2', 'values': [[formula_a2]]},
+        {'range': 'Inventory!J2', 'values': [[formula_j2]]},
+    ]
     
     # Step 5: Update Shipping Dashboard formula to reference Inventory instead of Purchases
     print("\n5. Updating Shipping Dashboard to reference Inventory...")
     
-    query_formula = '''=QUERY(
-  ARRAYFORMULA(
-    IF(Sales!A2:A<>"",
-      {
-        Sales!A2:A,
-        IFERROR(VLOOKUP(Sales!A2:A, Inventory!A:L, 3, FALSE), ""),
-        IFERROR(VLOOKUP(Sales!A2:A, Inventory!A:L, 4, FALSE), ""),
-        IFERROR(VLOOKUP(Sales!A2:A, Inventory!A:L, 5, FALSE), ""),
-        IFERROR(VLOOKUP(Sales!A2:A, Inventory!A:L, 6, FALSE), ""),
-        Sales!E2:E,
-        Sales!F2:F,
-        Sales!B2:B,
-        Sales!G2:G,
-        Sales!H2:H
-      },
-    )
-  ),
-  "WHERE Col1 IS NOT NULL"
-)'''
+    formula_data.append({'range': 'Shipping Dashboard!A2', 'values': [[SHIPPING_DASHBOARD_FORMULA]]})
     
-    service.spreadsheets().values().update(
+    # Write all formulas in a single request
+    service.spreadsheets().values().batchUpdate(
         spreadsheetId=spreadsheet_id,
-        range='Shipping Dashboard!A2',
-        valueInputOption='USER_ENTERED',
-        body={'values': [[query_formula]]}
-    ).execute()
+        body={'valueInputOption': 'USER_ENTERED', 'data': formula_data},
+        fields='totalUpdatedCells'
+    ).execute(num_retries=NUM_RETRIES)
     
     # Step 6: Add validations to Inventory
     print("\n6. Adding data validations to Inventory...")
     
-    requests = []
-    
-    # Size validation (Column E)
-    requests.append({
-        'setDataValidation': {
-            'range': {
-                'sheetId': inventory_sheet_id,
-                'startRowIndex': 1,
-                'endRowIndex': 1000,
-                'startColumnIndex': 4,
-                'endColumnIndex': 5
-            },
-            'rule': {
-                'condition': {
-                    'type': 'ONE_OF_LIST',
-                    'values': [
-                        {'userEnteredValue': 'XS'},
-                        {'userEnteredValue': 'S'},
-                        {'userEnteredValue': 'M'},
-                        {'userEnteredValue': 'L'},
-                        {'userEnteredValue': 'XL'},
-                        {'userEnteredValue': 'XXL'}
-                    ]
-                },
-                'showCustomUi': True
-            }
-        }
-    })
-    
-    # Condition validation (Column I)
-    requests.append({
-        'setDataValidation': {
-            'range': {
-                'sheetId': inventory_sheet_id,
-                'startRowIndex': 1,
-                'endRowIndex': 1000,
-                'startColumnIndex': 8,
-                'endColumnIndex': 9
-            },
-            'rule': {
-                'condition': {
-                    'type': 'ONE_OF_LIST',
-                    'values': [
-                        {'userEnteredValue': 'New'},
-                        {'userEnteredValue': 'Like New'},
-                        {'userEnteredValue': 'Good'},
-                        {'userEnteredValue': 'Fair'}
-                    ]
+    # One request per entry in INVENTORY_DROPDOWNS
+    requests = [
+        {
+            'setDataValidation': {
+                'range': {
+                    'sheetId': inventory_sheet_id,
+                    'startRowIndex': 1,
+                    'endRowIndex': 1000,
+                    'startColumnIndex': column,
+                    'endColumnIndex': column + 1
                 },
-                'showCustomUi': True
+                'rule': rule
             }
         }
-    })
-    
-    # Location validation (Column K)
-    requests.append({
-        'setDataValidation': {
-            'range': {
-                'sheetId': inventory_sheet_id,
-                'startRowIndex': 1,
-                'endRowIndex': 1000,
-                'startColumnIndex': 10,
-                'endColumnIndex': 11
-            },
-            'rule': {
-                'condition': {
-                    'type': 'ONE_OF_LIST',
-                    'values': [
-                        {'userEnteredValue': "Zach's garage"},
-                        {'userEnteredValue': "Adi's garage"}
-                    ]
-                },
-                'showCustomUi': True
-            }
-        }
-    })
-    
-    body = {'requests': requests}
-    service.spreadsheets().batchUpdate(
-        spreadsheetId=spreadsheet_id,
-        body=body
-    ).execute()
+        for column, rule in INVENTORY_DROPDOWN_RULES
+    ]
     
     # Step 7: Delete Purchases tab
     print("\n7. Deleting old Purchases tab...")
     
-    delete_request = {
+    requests.append({
         'deleteSheet': {
             'sheetId': purchases_sheet_id
         }
-    }
+    })
     
-    body = {'requests': [delete_request]}
+    # Apply the validations and the delete in one atomic request, so the
+    # Purchases tab is only removed if the validations were applied too
+    body = {'requests': requests}
     service.spreadsheets().batchUpdate(
         spreadsheetId=spreadsheet_id,
         body=body
@@ -292,6 +218,13 @@ def migrate_spreadsheet(service, spreadsheet_id):
 
 def main():
     """Main function."""
+    parser = argparse.ArgumentParser(
+        description="Migrate an existing spreadsheet to the consolidated 3-tab structure.")
+    parser.add_argument(
+        'spreadsheet', nargs='?',
+        help="Google Sheets URL or spreadsheet ID (prompted for if omitted)")
+    args = parser.parse_args()
+    
     print("\n=== Migrate to Consolidated Structure ===\n")
     print("This will:")
     print("  1. Merge Purchases tab into Inventory tab")
@@ -301,22 +234,9 @@ def main():
     print()
     
     # Get spreadsheet ID from command line or prompt
-    if len(sys.argv) > 1:
-        spreadsheet_id = sys.argv[1]
-    else:
+    if not args.spreadsheet:
         print("Enter your Google Sheets URL or Spreadsheet ID:")
-        user_input = input("URL or ID: ").strip()
-        
-        # Extract ID from URL if needed
-        if 'docs.google.com/spreadsheets' in user_input:
-            parts = user_input.split('/d/')
-            if len(parts) > 1:
-                spreadsheet_id = parts[1].split('/')[0]
-            else:
-                print("Error: Could not parse spreadsheet ID from URL")
-                exit(1)
-        else:
-            spreadsheet_id = user_input
+    spreadsheet_id = parse_spreadsheet_id(args.spreadsheet, SCOPES)
     
     print(f"\nSpreadsheet ID: {spreadsheet_id}")
     
@@ -328,9 +248,10 @@ def main():
     
     print("\nAuthenticating...")
     
+    from googleapiclient.errors import HttpError
+    
     try:
-        creds = get_credentials()
-        service = build('sheets', 'v4', credentials=creds)
+        service = get_service('sheets', 'v4', SCOPES)
         
         print("Starting migration...")
         